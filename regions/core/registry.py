@@ -3,10 +3,20 @@
 This module provides a RegionsRegistry class.
 """
 
-from astropy.table import Table
+import functools
+import os
+import sys
+from collections import defaultdict
 
 __all__ = []
 
+# registry method names
+_IDENTIFY = sys.intern('identify')
+_READ = sys.intern('read')
+_WRITE = sys.intern('write')
+_PARSE = sys.intern('parse')
+_SERIALIZE = sys.intern('serialize')
+
 
 class IORegistryError(Exception):
     """
@@ -22,21 +32,45 @@ class RegionsRegistry:
 
     registry = {}
 
+    # secondary indices of the registry, updated in ``register``
+    _identifiers_by_class = {}
+    _filetypes_by_class = defaultdict(set)
+    _methods_by_class_filetype = defaultdict(set)
+
+    # registered functions keyed by methodname and (classobj, filetype)
+    _dispatch = defaultdict(dict)
+
     @classmethod
     def register(cls, classobj, methodname, filetype):
+        # interned strings make the registry key comparisons cheaper
+        methodname = sys.intern(methodname)
+        filetype = sys.intern(filetype)
+
         def inner_wrapper(wrapped_func):
             key = (classobj, methodname, filetype)
             if key in cls.registry:
                 raise ValueError(f'{methodname} for {filetype} is already '
                                  f'registered for {classobj.__name__}')
             cls.registry[key] = wrapped_func
+            cls._dispatch[methodname][(classobj, filetype)] = wrapped_func
+
+            if methodname == _IDENTIFY:
+                # stored as a tuple so callers cannot modify the index
+                identifiers = cls._identifiers_by_class.get(classobj, ())
+                cls._identifiers_by_class[classobj] = (*identifiers, key)
+            cls._filetypes_by_class[classobj].add(filetype)
+            cls._methods_by_class_filetype[(classobj, filetype)].add(
+                methodname)
+
+            # a new identifier may change previously identified formats
+            cls._identify_format_cached.cache_clear()
+
             return wrapped_func
         return inner_wrapper
 
     @classmethod
     def get_identifiers(cls, classobj):
-        return [key for key in cls.registry
-                if key[0] == classobj and key[1] == 'identify']
+        return list(cls._identifiers_by_class.get(classobj, ()))
 
     @classmethod
     def _no_format_error(cls, classobj):
@@ -45,15 +79,34 @@ class RegionsRegistry:
                f'\n{cls._get_format_table_str(classobj)}')
         raise IORegistryError(msg)
 
+    @classmethod
+    def _identify_format(cls, filename, classobj, methodname):
+        for identifier in cls._identifiers_by_class.get(classobj, ()):
+            if cls.registry[identifier](methodname, filename):
+                return identifier[2]  # finds the first valid filetype
+
+        return None
+
+    @classmethod
+    @functools.lru_cache(maxsize=128)
+    def _identify_format_cached(cls, suffix, classobj, methodname):
+        return cls._identify_format(suffix, classobj, methodname)
+
     @classmethod
     def identify_format(cls, filename, classobj, methodname):
-        format = None
-        identifiers = cls.get_identifiers(classobj)
-        if identifiers:
-            for identifier in identifiers:
-                if cls.registry[identifier](methodname, filename):
-                    format = identifier[2]
-                    break  # finds the first valid filetype
+        suffix = ''
+        if methodname == _WRITE and isinstance(filename, str):
+            suffix = os.path.splitext(filename)[1].lower()
+
+        if suffix:
+            # writers identify the format from the (single) file name
+            # suffix only, so the result can be cached by suffix
+            format = cls._identify_format_cached(suffix, classobj,
+                                                 methodname)
+        else:
+            # readers may identify the format from the file contents,
+            # which can change, so the result is not cached
+            format = cls._identify_format(filename, classobj, methodname)
 
         if format is None:
             cls._no_format_error(classobj)
@@ -86,16 +139,14 @@ class RegionsRegistry:
             The regions object read from the file.
         """
         if format is None:
-            format = cls.identify_format(filename, classobj, 'read')
+            format = cls.identify_format(filename, classobj, _READ)
 
-        key = (classobj, 'read', format)
-        try:
-            reader = cls.registry[key]
-        except KeyError:
+        reader = cls._dispatch[_READ].get((classobj, format))
+        if reader is None:
             msg = (f'No reader defined for format "{format}" and class '
                    f'"{classobj.__name__}".\n'
                    f'{cls._get_format_table_str(classobj)}')
-            raise IORegistryError(msg) from None
+            raise IORegistryError(msg)
 
         return reader(filename, **kwargs)
 
@@ -127,14 +178,12 @@ class RegionsRegistry:
         if format is None:
             cls._no_format_error(classobj)
 
-        key = (classobj, 'parse', format)
-        try:
-            parser = cls.registry[key]
-        except KeyError:
+        parser = cls._dispatch[_PARSE].get((classobj, format))
+        if parser is None:
             msg = (f'No parser defined for format "{format}" and class '
                    f'"{classobj.__name__}".\n'
                    f'{cls._get_format_table_str(classobj)}')
-            raise IORegistryError(msg) from None
+            raise IORegistryError(msg)
 
         return parser(data, **kwargs)
 
@@ -162,16 +211,14 @@ class RegionsRegistry:
             Additional keyword arguments to pass to the writer.
         """
         if format is None:
-            format = cls.identify_format(filename, classobj, 'write')
+            format = cls.identify_format(filename, classobj, _WRITE)
 
-        key = (classobj, 'write', format)
-        try:
-            writer = cls.registry[key]
-        except KeyError:
+        writer = cls._dispatch[_WRITE].get((classobj, format))
+        if writer is None:
             msg = (f'No writer defined for format "{format}" and class '
                    f'"{classobj.__name__}".\n'
                    f'{cls._get_format_table_str(classobj)}')
-            raise IORegistryError(msg) from None
+            raise IORegistryError(msg)
 
         return writer(regions, filename, **kwargs)
 
@@ -203,14 +250,12 @@ class RegionsRegistry:
         if format is None:
             cls._no_format_error(classobj)
 
-        key = (classobj, 'serialize', format)
-        try:
-            serializer = cls.registry[key]
-        except KeyError:
+        serializer = cls._dispatch[_SERIALIZE].get((classobj, format))
+        if serializer is None:
             msg = (f'No serializer defined for format "{format}" and class '
                    f'"{classobj.__name__}".\n'
                    f'{cls._get_format_table_str(classobj)}')
-            raise IORegistryError(msg) from None
+            raise IORegistryError(msg)
 
         return serializer(regions, **kwargs)
 
@@ -229,37 +274,62 @@ class RegionsRegistry:
         tbl : Table
             The table of formats.
         """
-        filetypes = list({key[2] for key in cls.registry
-                          if key[0] == classobj})
+        from astropy.table import Table
+
+        header, rows = cls._get_formats_rows(classobj)
+
+        tbl = Table()
+        if not rows:
+            return tbl
+
+        cols = list(zip(*rows, strict=True))
+        for name, col in zip(header, cols, strict=True):
+            tbl[name] = col
+
+        return tbl
+
+    @classmethod
+    def _get_formats_rows(cls, classobj):
+        """
+        Get the registered I/O formats as a header and a list of rows.
+        """
+        header = ('Format', 'Parse', 'Serialize', 'Read', 'Write',
+                  'Auto-identify')
 
-        rows = [['Format', 'Parse', 'Serialize', 'Read', 'Write',
-                 'Auto-identify']]
+        rows = []
+        filetypes = cls._filetypes_by_class.get(classobj, ())
         for filetype in sorted(filetypes):
-            keys = {key[1] for key in cls.registry
-                    if key[0] == classobj and key[2] == filetype}
+            keys = cls._methods_by_class_filetype[(classobj, filetype)]
             row = [filetype]
-            for methodname in rows[0][1:]:
+            for methodname in header[1:]:
                 name = ('identify' if 'identify' in methodname
                         else methodname.lower())
                 row.append('Yes' if name in keys else 'No')
-            rows.append(row)
+            rows.append(tuple(row))
 
-        if len(rows) == 1:
-            return Table()
-
-        cols = list(zip(*rows, strict=True))
-        tbl = Table()
-        for col in cols:
-            tbl[col[0]] = col[1:]
-
-        return tbl
+        return header, rows
 
     @classmethod
     def _get_format_table_str(cls, classobj):
         lines = ['', f'The available formats for the {classobj.__name__} '
                  'class are:', '']
-        tbl = cls.get_formats(classobj)
-        lines.extend(tbl.pformat(max_lines=-1, max_width=80))
+
+        # format the table directly (matching the Table.pformat output)
+        # to avoid creating a Table
+        header, rows = cls._get_formats_rows(classobj)
+        if not rows:
+            lines.append('<No columns>')
+        else:
+            widths = [max(len(cell) for cell in col)
+                      for col in zip(header, *rows, strict=True)]
+            lines.append(' '.join(name.rjust(width)
+                                  for name, width in zip(header, widths,
+                                                         strict=True)))
+            lines.append(' '.join('-' * width for width in widths))
+            lines.extend(' '.join(cell.rjust(width) for cell, width
+                                  in zip(row, widths, strict=True))
+                         for row in rows)
+
         return '\n'.join(lines)
 
 
@@ -270,7 +340,7 @@ def _update_docstring(classobj, methodname):
     """
     import re
 
-    if methodname == 'identify':
+    if methodname == _IDENTIFY:
         return
 
     lines = getattr(classobj, methodname).__doc__.splitlines()
@@ -0,0 +1,88 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Tests for the registry module.
+"""
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import SkyCoord
+
+from regions.core import Region, Regions
+from regions.core.registry import IORegistryError, RegionsRegistry
+from regions.shapes import CircleSkyRegion
+
+
+def test_identify_format_write():
+    assert RegionsRegistry.identify_format('test.reg', Regions,
+                                           'write') == 'ds9'
+    assert RegionsRegistry.identify_format('test.crtf', Regions,
+                                           'write') == 'crtf'
+    assert RegionsRegistry.identify_format('test.fits', Regions,
+                                           'write') == 'fits'
+
+    with pytest.raises(IORegistryError):
+        RegionsRegistry.identify_format('test.txt', Regions, 'write')
+
+
+def test_identify_format_write_cache():
+    """
+    Test that write format identification is cached by file name
+    suffix and that the cache is cleared when registering a format.
+    """
+    RegionsRegistry._identify_format_cached.cache_clear()
+    assert RegionsRegistry.identify_format('test1.reg', Regions,
+                                           'write') == 'ds9'
+    assert RegionsRegistry.identify_format('TEST2.REG', Regions,
+                                           'write') == 'ds9'
+    cache_info = RegionsRegistry._identify_format_cached.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+    assert cache_info.currsize == 1
+
+    class TestRegions(Regions):
+        pass
+
+    @RegionsRegistry.register(TestRegions, 'identify', 'test')
+    def is_test(methodname, filepath):
+        return filepath.lower().endswith('.reg')
+
+    cache_info = RegionsRegistry._identify_format_cached.cache_info()
+    assert cache_info.currsize == 0
+    assert RegionsRegistry.identify_format('test.reg', TestRegions,
+                                           'write') == 'test'
+
+
+def test_identify_format_read_contents(tmp_path):
+    """
+    Test that the format identified from the file contents is updated
+    when the file changes.
+    """
+    center = SkyCoord(10, 20, unit='deg')
+    regions = Regions([CircleSkyRegion(center, radius=1 * u.deg)])
+    filename = str(tmp_path / 'test.txt')
+
+    regions.write(filename, format='ds9')
+    assert RegionsRegistry.identify_format(filename, Regions,
+                                           'read') == 'ds9'
+
+    regions.write(filename, format='crtf', overwrite=True)
+    assert RegionsRegistry.identify_format(filename, Regions,
+                                           'read') == 'crtf'
+
+
+@pytest.mark.parametrize('classobj', [Region, Regions])
+def test_format_table_str(classobj):
+    """
+    Test that the format table string matches the formatted Table.
+    """
+    tbl = RegionsRegistry.get_formats(classobj)
+    expected = tbl.pformat(max_lines=-1, max_width=80)
+    lines = RegionsRegistry._get_format_table_str(classobj).splitlines()
+    assert lines[3:] == expected
+
+
+def test_get_identifiers_copy():
+    identifiers = RegionsRegistry.get_identifiers(Regions)
+    assert isinstance(identifiers, list)
+    identifiers.clear()
+    assert len(RegionsRegistry.get_identifiers(Regions)) == 3
@@ -8,6 +8,20 @@ from regions.io.ds9.core import DS9ParserError, ds9_valid_symbols
 
 __all__ = []
 
+# ds9 meta keys
+_DS9_META_KEYS = ('background', 'delete', 'edit', 'fixed', 'highlite',
+                  'include', 'move', 'rotate', 'select', 'source', 'tag',
+                  'text')
+_DS9_VISUAL_KEYS = ('color', 'dash', 'dashlist', 'fill', 'font', 'point',
+                    'textangle', 'textrotate', 'width')
+_DS9_VALID_KEYS = frozenset(_DS9_META_KEYS + _DS9_VISUAL_KEYS)
+
+# mapping from matplotlib marker symbols to ds9 point symbols
+_DS9_SYMBOL_MAP = {val: key for key, val in ds9_valid_symbols.items()}
+
+# ds9 font: "fontname fontsize fontweight fontstyle"
+_DS9_FONT_TEMPLATE = '"%s %s %s %s"'
+
 
 def _split_raw_metadata(raw_metadata):
     """
@@ -172,23 +186,24 @@ def _translate_ds9_to_visual(shape, visual_meta):
     return meta
 
 
-def _remove_invalid_keys(region_meta, valid_keys):
-    # TODO: instead of new dict, del region_meta in-place?
-    meta = {}
-    for key in region_meta:
-        if key in valid_keys:
-            meta[key] = region_meta[key]
-    return meta
+def _remove_invalid_keys(region_meta):
+    # remove the keys in-place to avoid creating a new dict
+    invalid_keys = [key for key in region_meta if key not in _DS9_VALID_KEYS]
+    for key in invalid_keys:
+        del region_meta[key]
 
 
 def _translate_metadata_to_ds9(region, shape):
     """
     Translate region metadata to valid ds9 meta keys.
     """
-    meta = {**region.meta, **region.visual}
-    # special case for Text regions
+    # merge the metadata into a single new dict that is modified
+    # in-place below; special case for Text regions
+    meta = {}
     if 'text' in region._params:
-        meta = {'text': region.text, **meta}
+        meta['text'] = region.text
+    meta.update(region.meta)
+    meta.update(region.visual)
 
     if 'annulus' in shape:
         # ds9 does not allow fill for annulus regions
@@ -226,13 +241,12 @@ def _translate_metadata_to_ds9(region, shape):
 
     marker = meta.pop('marker', None)
     if marker is not None:
-        symbol_map = {y: x for x, y in ds9_valid_symbols.items()}
-        if marker in symbol_map:
+        if marker in _DS9_SYMBOL_MAP:
             markersize = meta.pop('markersize', None)
             msize = ''
             if markersize is not None:
                 msize = f' {markersize}'
-            meta['point'] = f'{symbol_map[marker]}{msize}'
+            meta['point'] = f'{_DS9_SYMBOL_MAP[marker]}{msize}'
         else:
             warnings.warn(f'Unable to serialize marker "{marker}"',
                           AstropyUserWarning)
@@ -243,7 +257,8 @@ def _translate_metadata_to_ds9(region, shape):
         fontweight = meta.pop('fontweight', 'normal')  # default normal
         # default roman
         fontstyle = meta.pop('fontstyle', 'roman').replace('normal', 'roman')
-        meta['font'] = f'"{fontname} {fontsize} {fontweight} {fontstyle}"'
+        meta['font'] = _DS9_FONT_TEMPLATE % (fontname, fontsize, fontweight,
+                                             fontstyle)
 
     linestyle = meta.pop('linestyle', None)
     if linestyle is not None:
@@ -261,13 +276,6 @@ def _translate_metadata_to_ds9(region, shape):
         meta['textangle'] = rotation
         # meta['textrotate'] = 1
 
-    # ds9 meta keys
-    meta_keys = ['background', 'delete', 'edit', 'fixed', 'highlite',
-                 'include', 'move', 'rotate', 'select', 'source', 'tag',
-                 'text']
-    visual_keys = ['color', 'dash', 'dashlist', 'fill', 'font', 'point',
-                   'textangle', 'textrotate', 'width']
-    valid_keys = meta_keys + visual_keys
-    meta = _remove_invalid_keys(meta, valid_keys)
+    _remove_invalid_keys(meta)
 
     return meta
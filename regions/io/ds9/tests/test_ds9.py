@@ -54,6 +54,53 @@ def test_serialize():
     assert actual == expected
 
 
+@pytest.mark.parametrize('precision', [3, 8])
+def test_roundtrip_small_radius(precision):
+    """
+    Test that a sub-milliarcsecond radius keeps its significant digits
+    when serialized.
+    """
+    radius = 1.0e-3 * u.arcsec
+    region = CircleSkyRegion(SkyCoord(1, 2, unit='deg'), radius)
+    ds9_str = region.serialize(format='ds9', precision=precision)
+    region2 = Regions.parse(ds9_str, format='ds9')[0]
+    assert_quantity_allclose(region2.radius, radius,
+                             rtol=10.0**(1 - precision))
+
+
+def test_serialize_unhashable_global_meta():
+    """
+    Test serialization of a global metadata item with an unhashable
+    value.
+    """
+    meta = {'source': [1, 2]}
+    regions = Regions([CirclePixelRegion(PixCoord(42, 43), radius=3,
+                                         meta=meta.copy()),
+                       CirclePixelRegion(PixCoord(10, 20), radius=5,
+                                         meta=meta.copy())])
+    expected = ('# Region file format: DS9 astropy/regions\n'
+                'global source=[1, 2]\nimage\n'
+                'circle(43.0000,44.0000,3.0000)\n'
+                'circle(11.0000,21.0000,5.0000)\n')
+    actual = regions.serialize(format='ds9', precision=4)
+    assert actual == expected
+
+
+def test_serialize_font():
+    """
+    Test serialization of the font visual metadata.
+    """
+    visual = RegionVisual(fontname='times', fontsize=12, fontweight='bold',
+                          fontstyle='italic')
+    region = TextPixelRegion(PixCoord(42, 43), text='Text', visual=visual)
+    actual = region.serialize(format='ds9', precision=4)
+    assert 'font="times 12 bold italic"' in actual
+
+    region.visual = RegionVisual(fontname='times')
+    actual = region.serialize(format='ds9', precision=4)
+    assert 'font="times 10 normal roman"' in actual
+
+
 def test_serialize_parse_text():
     """
     Test serialization of Text region.
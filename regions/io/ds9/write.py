@@ -1,10 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
+import operator
 import os
+import string
 import warnings
 from copy import deepcopy
+from dataclasses import dataclass
 
-from astropy.coordinates import Angle, SkyCoord
+import numpy as np
+from astropy.coordinates import Angle, SkyCoord, SphericalRepresentation
 from astropy.units import Quantity
 from astropy.utils.exceptions import AstropyUserWarning
 
@@ -17,14 +21,48 @@ from regions.shapes import RegularPolygonPixelRegion
 
 __all__ = []
 
+# mapping from astropy coordinate frames to DS9 frames
+_DS9_FRAME_MAPPING = {v: k for k, v in ds9_frame_map.items()}
+
+
+def _parse_shape_template(template):
+    """
+    Split a shape template string into its literal text and field
+    names, e.g., '{center},{radius}' -> (('', 'center'), (',', 'radius')).
+    """
+    return tuple((literal, field_name) for literal, field_name, _, _
+                 in string.Formatter().parse(template))
+
+
+# pre-parsed shape templates, used to avoid parsing the template format
+# string for every serialized region
+_DS9_SHAPE_TEMPLATE_PARTS = {shape: _parse_shape_template(template)
+                             for shape, (_, template)
+                             in ds9_shape_templates.items()}
+
 
 @RegionsRegistry.register(Region, 'serialize', 'ds9')
 @RegionsRegistry.register(Regions, 'serialize', 'ds9')
 def _serialize_ds9(regions, precision=8):
+    return ''.join(_iter_ds9_lines(regions, precision=precision))
+
+
+def _iter_ds9_lines(regions, precision=8):
+    """
+    Generate the lines (including newlines) of the DS9 serialization
+    of a list of `~regions.Region`.
+
+    All regions are serialized before the first line is generated.
+    """
     if not regions:
-        return ''
+        return
 
+    # serialize the regions, while extracting the common region
+    # metadata (to place in the global metadata) and the coordinate
+    # frames in the same pass
     region_data = []
+    global_meta = None
+    frames = set()
     for region in regions:
         if isinstance(region, (CompoundPixelRegion, CompoundSkyRegion)):
             warnings.warn('Cannot serialize a compound region, skipping',
@@ -33,54 +71,51 @@ def _serialize_ds9(regions, precision=8):
         if isinstance(region, RegularPolygonPixelRegion):
             region = region.to_polygon()
 
-        region_data.append(_serialize_region_ds9(region, precision=precision))
+        data = _serialize_region_ds9(region, precision=precision)
+        region_data.append(data)
+        frames.add(data['frame'])
+
+        # drop items that differ from the common metadata; this does
+        # not require the metadata values to be hashable
+        meta = data['meta']
+        if global_meta is None:
+            # "tag" cannot be in global metadata
+            global_meta = {key: val for key, val in meta.items()
+                           if key != 'tag'}
+        else:
+            for key in list(global_meta):
+                if key not in meta or meta[key] != global_meta[key]:
+                    del global_meta[key]
 
     # ds9 file header
-    output = '# Region file format: DS9 astropy/regions\n'
+    yield '# Region file format: DS9 astropy/regions\n'
 
-    # extract common region metadata and place in the global metadata
-    all_meta = []
-    for region in region_data:
-        region_meta = deepcopy(region['meta'])
-        region_meta.pop('tag', None)  # "tag" cannot be in global metadata
-        all_meta.append(region_meta)
-
-    global_meta = dict(set.intersection(*[set(meta_dict.items())
-                                          for meta_dict in all_meta]))
     if global_meta:
-        output += f'global {_make_meta_str(global_meta)}\n'
-
-    # define region frame and metadata (removing items that are
-    # defined in global metadata)
-    frames = []
-    metadata = []
-    for region in region_data:
-        frames.append(region['frame'])
-        meta_tmp = region['meta']
-        for key in global_meta:
-            meta_tmp.pop(key)
-        metadata.append(meta_tmp)
+        yield f'global {_make_meta_str(global_meta)}\n'
 
     # extract the coordinate frame if it is identical for all regions
     # TODO: extract common coord frame(s) for block(s) of consecutive regions
-    frames = set(frames)
     global_frame = None
     if len(frames) == 1:
         global_frame = frames.pop()
-        output += f'{global_frame}\n'
+        yield f'{global_frame}\n'
+
+    # add line for each region (removing metadata items that are
+    # defined in global metadata)
+    for region in region_data:
+        region_meta = region['meta']
+        for key in global_meta:
+            region_meta.pop(key)
 
-    # add line for each region
-    for region, region_meta in zip(region_data, metadata, strict=True):
+        frame_str = ''
         if global_frame is None:
-            output += f'{region["frame"]}; '
+            frame_str = f'{region["frame"]}; '
 
         meta_str = _make_meta_str(region_meta)
         if meta_str:
             meta_str = f' # {meta_str}'
 
-        output += f'{region["region"]}{meta_str}\n'
-
-    return output
+        yield f'{frame_str}{region["region"]}{meta_str}\n'
 
 
 @RegionsRegistry.register(Region, 'write', 'ds9')
@@ -109,28 +144,67 @@ def _write_ds9(regions, filename, *, precision=8, overwrite=False):
     if os.path.lexists(filename) and not overwrite:
         raise OSError(f'{filename} already exists')
 
-    output = _serialize_ds9(regions, precision=precision)
-    with open(filename, 'w') as fh:
-        fh.write(output)
+    # all regions are serialized when the first line is generated, so
+    # get it before opening the file to avoid leaving a truncated file
+    # if serialization fails
+    lines = _iter_ds9_lines(regions, precision=precision)
+    first_line = next(lines, '')
+    with open(filename, 'w', buffering=1 << 20) as fh:
+        fh.write(first_line)
+        fh.writelines(lines)
 
 
-def _get_region_shape(region):
-    shape = region.__class__.__name__.lower().replace('skyregion', '')
+@dataclass(frozen=True)
+class _RegionClassInfo:
+    """
+    Class to hold the DS9 serialization data that depend only on the
+    region class.
+    """
+
+    shape: str
+    frame_getter: operator.attrgetter | None
+
+
+# cache of _RegionClassInfo objects keyed by region class
+_REGION_CLASS_CACHE = {}
+
+
+def _get_region_class_info(region):
+    cls = type(region)
+    try:
+        return _REGION_CLASS_CACHE[cls]
+    except KeyError:
+        pass
+
+    shape = cls.__name__.lower().replace('skyregion', '')
     shape = shape.replace('pixelregion', '')
-    return shape
+
+    # get the frame name from the region parameter that defines the
+    # coordinate frame
+    frame_getter = None
+    for param in ('center', 'vertices', 'start'):
+        if param in region._params:
+            frame_getter = operator.attrgetter(f'{param}.frame.name')
+            break
+
+    info = _RegionClassInfo(shape, frame_getter)
+    _REGION_CLASS_CACHE[cls] = info
+    return info
+
+
+def _get_region_shape(region):
+    return _get_region_class_info(region).shape
 
 
 def _get_frame_name(region, mapping):
     if isinstance(region, PixelRegion):
         frame = 'image'
-    elif 'center' in region._params:
-        frame = region.center.frame.name
-    elif 'vertices' in region._params:
-        frame = region.vertices.frame.name
-    elif 'start' in region._params:
-        frame = region.start.frame.name
     else:
-        raise ValueError(f'Unable to get coordinate frame for {region!r}')
+        frame_getter = _get_region_class_info(region).frame_getter
+        if frame_getter is None:
+            raise ValueError(
+                f'Unable to get coordinate frame for {region!r}')
+        frame = frame_getter(region)
 
     if frame not in mapping:
         warnings.warn(f'Cannot serialize region with frame={frame}, skipping',
@@ -149,11 +223,17 @@ def _make_meta_str(meta):
     return ' '.join(metalist)
 
 
-def _get_region_params(region, shape_template, precision=8):
+def _get_region_params(region, shape, precision=8):
     ellipse_axes = ('width', 'height', 'inner_width', 'inner_height',
                     'outer_width', 'outer_height')
     ellipse_names = ('ellipse', 'ellipseannulus')
 
+    region_type = ds9_shape_templates[shape][0]
+    template_parts = _DS9_SHAPE_TEMPLATE_PARTS[shape]
+
+    # float format specifier for the given precision
+    fspec = f'%.{precision}f'
+
     param = {}
     for param_name in region._params:
         if param_name in ('text',):
@@ -163,7 +243,7 @@ def _get_region_params(region, shape_template, precision=8):
 
         # DS9 ellipse parameters are serialized as semi-axis lengths, but
         # ellipse region is defined by full axis lengths
-        is_ellipse = (shape_template[0] in ellipse_names
+        is_ellipse = (region_type in ellipse_names
                       and param_name in ellipse_axes)
         if not isinstance(value, (PixCoord, SkyCoord)) and is_ellipse:
             # deepcopy to prevent changing value in memory
@@ -172,55 +252,57 @@ def _get_region_params(region, shape_template, precision=8):
         if isinstance(value, PixCoord):
             # pixels; ds9's origin is (1, 1)
             if value.isscalar:
-                value = (f'{value.x + 1:0.{precision}f},'
-                         f'{value.y + 1:0.{precision}f}')
+                value = f'{fspec},{fspec}' % (value.x + 1, value.y + 1)
             else:
-                value_str = ''
-                for val in value:
-                    value_str += (f'{val.x + 1:0.{precision}f},'
-                                  f'{val.y + 1:0.{precision}f},')
-                value = value_str[:-1]
+                xy = np.column_stack((value.x + 1, value.y + 1))
+                value = ','.join(np.char.mod(fspec, xy.ravel()).tolist())
 
         elif isinstance(value, SkyCoord):
-            val = value.to_string(precision=precision)
+            # format the longitude/latitude values (in degrees) directly
+            # instead of using the much slower SkyCoord.to_string;
             # polygon region has multiple SkyCoord
-            value = ' '.join(val) if not value.isscalar else val
-            value = value.replace(' ', ',')
+            sph_coord = value.frame.represent_as(SphericalRepresentation)
+            lonlat = np.column_stack((np.atleast_1d(sph_coord.lon.deg),
+                                      np.atleast_1d(sph_coord.lat.deg)))
+            value = ','.join(np.char.mod(fspec, lonlat.ravel()).tolist())
 
         elif isinstance(value, Angle):
             value = value.to_string(unit='deg', decimal=True,
                                     precision=precision)
 
         elif isinstance(value, Quantity):
+            # Quantity.to_string uses scientific notation for small
+            # values, which preserves their significant digits;
             # [:-4] to trim ' deg' from string end
             value = value.to_string(unit='deg', precision=precision)[:-4]
 
         else:
-            value = f'{value:.{precision}f}'
+            value = fspec % value
 
         param[param_name] = value
 
+    param_str = []
     try:
-        param_str = shape_template[1].format(**param)
+        for literal, field_name in template_parts:
+            param_str.append(literal)
+            if field_name is not None:
+                param_str.append(param[field_name])
     except KeyError as err:
         raise ValueError(
             f'Unable to get shape parameters for {region!r}') from err
 
-    return param_str
+    return ''.join(param_str)
 
 
 def _serialize_region_ds9(region, precision=8):
-    frame_mapping = {v: k for k, v in ds9_frame_map.items()}
-    frame = _get_frame_name(region, mapping=frame_mapping)
+    frame = _get_frame_name(region, mapping=_DS9_FRAME_MAPPING)
 
     shape = _get_region_shape(region)
     if shape not in ds9_shape_templates:
         warnings.warn(f'Cannot serialize region shape "{shape}", '
                       'skipping', AstropyUserWarning)
 
-    region_params = _get_region_params(region,
-                                       ds9_shape_templates[shape],
-                                       precision=precision)
+    region_params = _get_region_params(region, shape, precision=precision)
 
     region_type = ds9_shape_templates[shape][0]
     region_str = f'{region_type}({region_params})'